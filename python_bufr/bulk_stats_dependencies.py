@@ -2,11 +2,23 @@ import numpy as np
 import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.cm as cm
-from matplotlib import colors 
+from matplotlib import colors
 import copy
+import functools
 import cartopy
 import cartopy.feature as cfeat
 import cartopy.crs as ccrs
+# numba accelerates the ob-density binning kernel when available, but is optional:
+# without it, ob_density_plot falls back to an equivalent numpy bincount pass
+try:
+    from numba import njit
+    have_numba = True
+except ImportError:
+    have_numba = False
+# Natural Earth coastline feature staged once at module scope: figax.coastlines()
+# re-parses the shapefile on every call, so sharing this feature across all scorecard
+# figures amortizes the download/parse cost over every tank plotted
+_COAST = cfeat.NaturalEarthFeature('physical','coastline','50m',edgecolor='black',facecolor='none',linewidth=2)
 #
 # General Purpose Functions
 #   can_float                Returns True if input can be converted to a float, otherwise returns False
@@ -22,20 +34,65 @@ def can_float(element: any) -> bool:
         return False
 
 def spddir_to_uwdvwd(spd,ang):
-    import numpy as np
-    uwd=-spd*np.sin(ang*(np.pi/180.))
-    vwd=-spd*np.cos(ang*(np.pi/180.))
+    # convert to radians once, rather than producing a separate ang*(pi/180.)
+    # temporary for each of the sin and cos passes
+    rad=np.deg2rad(ang)
+    uwd=-spd*np.sin(rad)
+    vwd=-spd*np.cos(rad)
     return uwd, vwd
 
 def truncate_colormap(cmap, minval=0.0, maxval=1.0, n=100):
-    import numpy as np
-    import matplotlib.cm as cm
-    from matplotlib import colors
     new_cmap = colors.LinearSegmentedColormap.from_list(
         'trunc({n},{a:.2f},{b:.2f})'.format(n=cmap.name, a=minval, b=maxval),
         cmap(np.linspace(minval, maxval, n)))
     return new_cmap
 
+@functools.lru_cache(maxsize=32)
+def truncate_colormap_cached(name, minval=0.0, maxval=1.0, n=100):
+    # Memoized front-end to truncate_colormap keyed on the source colormap name:
+    # building the truncated LUT evaluates the source colormap at n points, and the
+    # scorecard plots request the same two truncations for every tank plotted
+    return truncate_colormap(cm.get_cmap(name), minval, maxval, n)
+
+def _uniform_hist(x, edges):
+    # Histogram counts over uniform bin-edges: the bin index is computed
+    # arithmetically and counted with np.bincount, which is considerably faster
+    # than the generic searchsorted path taken by np.histogram/ax.hist
+    dx=edges[1]-edges[0]
+    # drop NaN and out-of-range obs before binning (NaN comparisons are False,
+    # so they fall out of the mask too): ax.hist/np.histogram silently exclude
+    # them, where a clamped index would pile them into the first/last bars; the
+    # clip keeps the last bin-edge right-inclusive, as in np.histogram
+    valid=(x>=edges[0])&(x<=edges[-1])
+    idx=np.clip(((x[valid]-edges[0])/dx).astype(np.intp),0,np.size(edges)-2)
+    return np.bincount(idx,minlength=np.size(edges)-1)
+
+if have_numba:
+    # _hist_pre_split: fused binning kernel for ob_density_plot
+    # Computes the upper- and lower-troposphere 2d histograms in a single loop over the
+    # obs vectors: pressure classification, bin-index computation, and accumulation all
+    # happen per-element in registers, with no intermediate arrays. Kept serial rather
+    # than parallel since indexed increments into a shared histogram would race.
+    @njit(cache=True)
+    def _hist_pre_split(ob_lon,ob_lat,ob_pre,lon_min,dlon,nlon,lat_min,dlat,nlat):
+        H=np.zeros((2,nlon,nlat),dtype=np.int64)
+        for i in range(ob_lon.size):
+            xval=(ob_lon[i]-lon_min)/dlon
+            yval=(ob_lat[i]-lat_min)/dlat
+            # skip NaN and out-of-range obs (e.g. 1.0E+10 missing-value
+            # sentinels): np.histogram2d drops them, so clamping them into the
+            # edge bins would put phantom counts in the corner cells; NaN
+            # pressure obs are likewise dropped, as the baseline per-layer
+            # np.where subsetting excluded them from both histograms
+            if np.isnan(xval) or np.isnan(yval) or np.isnan(ob_pre[i]) or xval<0. or xval>nlon or yval<0. or yval>nlat:
+                continue
+            # the last bin-edge is right-inclusive, as in np.histogram2d
+            ix=int(xval) if xval<nlon else nlon-1
+            iy=int(yval) if yval<nlat else nlat-1
+            iz=0 if ob_pre[i]<50000. else 1
+            H[iz,ix,iy]+=1
+        return H[0],H[1]
+
 def ob_density_plot(ob_lat,ob_lon,ob_pre,lat_rng,lon_rng,figax):
     # Generates a heatmap of observation density by latitude and longitude
     # Splits into 2 heatmaps for upper- vs lower-tropospheric ob density based on pressure
@@ -51,37 +108,56 @@ def ob_density_plot(ob_lat,ob_lon,ob_pre,lat_rng,lon_rng,figax):
     #   figreturn: returned axis
     # DEPENDENCIES: matplotlib, numpy, cartopy
     #
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import matplotlib.cm as cm
-    import cartopy.crs as ccrs
-    import cartopy.feature as cfeature
     # Compute total ob-count
     totobs=np.size(ob_lat)
-    # Compute 2d histogram for upper-troposphere
-    idx=np.where(ob_pre<50000.) # Pa
-    uH,xe,ye=np.histogram2d(ob_lon[idx],ob_lat[idx],bins=(lon_rng,lat_rng))
-    # Compute 2d histogram for lower-troposphere
-    idx=np.where(ob_pre>=50000.) # Pa
-    lH,xe,ye=np.histogram2d(ob_lon[idx],ob_lat[idx],bins=(lon_rng,lat_rng))
-    # Compute bin centers
-    xc=0.5*(xe[0:-1]+xe[1:])
-    yc=0.5*(ye[0:-1]+ye[1:])
+    # Compute upper- and lower-troposphere 2d histograms in a single pass: bin indices
+    # are computed arithmetically from the (uniform) bin-widths and combined with a 0/1
+    # pressure-layer index (0==upper-troposphere, 1==lower-troposphere, split at
+    # 50000. Pa). The numba kernel fuses the whole pass when available, otherwise an
+    # equivalent flat-index np.bincount is used.
+    nlon=np.size(lon_rng)-1
+    nlat=np.size(lat_rng)-1
+    dlon=lon_rng[1]-lon_rng[0]
+    dlat=lat_rng[1]-lat_rng[0]
+    if have_numba:
+        uH,lH=_hist_pre_split(ob_lon,ob_lat,ob_pre,lon_rng[0],dlon,nlon,lat_rng[0],dlat,nlat)
+    else:
+        xval=(ob_lon-lon_rng[0])/dlon
+        yval=(ob_lat-lat_rng[0])/dlat
+        # drop NaN and out-of-range obs before binning (NaN comparisons are
+        # False, so missing positions fall out of the mask too), matching
+        # np.histogram2d; NaN pressure obs are dropped explicitly since the 0/1
+        # layer index would otherwise silently file them in one layer, and the
+        # last bin-edge stays right-inclusive via the clip
+        valid=(xval>=0.)&(xval<=nlon)&(yval>=0.)&(yval<=nlat)&(~np.isnan(ob_pre))
+        ix=np.minimum(xval[valid].astype(np.intp),nlon-1)
+        iy=np.minimum(yval[valid].astype(np.intp),nlat-1)
+        iz=(ob_pre[valid]>=50000.).astype(np.intp) # Pa
+        H=np.bincount((iz*nlon+ix)*nlat+iy,minlength=2*nlon*nlat).reshape(2,nlon,nlat)
+        uH=H[0]
+        lH=H[1]
     # Define plot projection transform
     transform=figax.projection
     figreturn=figax
     # Generate plot
+    # the bins are uniform by construction, so imshow with an extent renders the same
+    # image as pcolormesh without building a QuadMesh with per-cell coordinates
+    extent=[lon_rng[0],lon_rng[-1],lat_rng[0],lat_rng[-1]]
+    # compute the shared color-scale bounds once: both layers scale against the
+    # total (upper+lower) density maximum, and recomputing np.max(uH+lH) inline
+    # would sum and reduce the full grid twice
+    totMax=float(np.max(uH+lH))
+    vmin=0.05*totMax
+    vmax=totMax
     #colmap=cm.get_cmap('gist_ncar').copy()
-    colmap=cm.get_cmap('gist_ncar')
-    colmap=truncate_colormap(colmap,0.15,0.35,n=256)
-    lpfill=figax.pcolormesh(xc, yc, lH.T, transform=transform, cmap=colmap,alpha=0.67,vmin=0.05*np.max(uH+lH),vmax=np.max(uH+lH))
+    colmap=truncate_colormap_cached('gist_ncar',0.15,0.35,n=256)
+    lpfill=figax.imshow(lH.T, transform=transform, extent=extent, origin='lower', interpolation='nearest', cmap=colmap,alpha=0.67,vmin=vmin,vmax=vmax,rasterized=True)
     lpfill.cmap.set_under('w')
     #colmap=cm.get_cmap('gist_ncar').copy()
-    colmap=cm.get_cmap('gist_ncar')
-    colmap=truncate_colormap(colmap,0.60,0.80,n=256)
-    upfill=figax.pcolormesh(xc, yc, uH.T, transform=transform, cmap=colmap,alpha=0.67,vmin=0.05*np.max(uH+lH),vmax=np.max(uH+lH))
+    colmap=truncate_colormap_cached('gist_ncar',0.60,0.80,n=256)
+    upfill=figax.imshow(uH.T, transform=transform, extent=extent, origin='lower', interpolation='nearest', cmap=colmap,alpha=0.67,vmin=vmin,vmax=vmax,rasterized=True)
     upfill.cmap.set_under('w')
-    pmap=figax.coastlines(resolution='50m',linewidth=2)
+    pmap=figax.add_feature(_COAST)
     # Add colorbar
     plt.colorbar(upfill,label='Upper Troposphere')
     plt.colorbar(lpfill,label='Lower Troposphere')
@@ -120,25 +196,29 @@ def ob_hist_latlonpre(ob_lat,ob_lon,ob_pre,lat_rng,lon_rng,pre_rng,figax1,figax2
     #   figreturn: returned axes
     # DEPENDENCIES: matplotlib, numpy
     #
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import matplotlib.cm as cm
+    # counts are precomputed with _uniform_hist and drawn with ax.bar: ax.hist
+    # re-bins through np.histogram's generic path on every call, while the bin
+    # edges here are uniform np.arange vectors
     # Generate pressure-histogram
     ax=figax1
     dy=pre_rng[1]-pre_rng[0]
-    ax.hist(ob_pre,pre_rng,orientation="horizontal",facecolor='#0C00FF',edgecolor='w')
+    h=_uniform_hist(ob_pre,pre_rng)
+    ax.barh(0.5*(pre_rng[0:-1]+pre_rng[1:]),h,height=dy,facecolor='#0C00FF',edgecolor='w')
     ax.set_ylim((np.min(ob_pre)-dy,np.max(ob_pre)+dy))
     ax.invert_yaxis()
     ax.set_title('count by pressure')
     # Generate latitude-histogram
     ax=figax2
     dx=lat_rng[1]-lat_rng[0]
-    ax.hist(ob_lat,lat_rng,facecolor='#E86D00',edgecolor='w')
+    h=_uniform_hist(ob_lat,lat_rng)
+    ax.bar(0.5*(lat_rng[0:-1]+lat_rng[1:]),h,width=dx,facecolor='#E86D00',edgecolor='w')
     ax.set_xlim((np.min(ob_lat)-dx,np.max(ob_lat)+dx))
     ax.set_title('count by latitude')
     # Generate longitude-histogram
     ax=figax3
-    ax.hist(ob_lon,lon_rng,facecolor='#D7D700',edgecolor='w')
+    dx=lon_rng[1]-lon_rng[0]
+    h=_uniform_hist(ob_lon,lon_rng)
+    ax.bar(0.5*(lon_rng[0:-1]+lon_rng[1:]),h,width=dx,facecolor='#D7D700',edgecolor='w')
     ax.set_xlim((np.min(ob_lon)-dx,np.max(ob_lon)+dx))
     ax.set_title('count by longitude')
     # Return figure axes
@@ -173,9 +253,6 @@ def ob_hist_spddirqc(ob_spd,ob_dir,ob_qc,spd_rng,dir_rng,figax1,figax2,figax3):
     #   figreturn: returned axes
     # DEPENDENCIES: matplotlib, numpy
     #
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import matplotlib.cm as cm
     # NOTES:
     #       Sometimes QC is all np.nan values, in which case we will present a blank pie-chart
     #
@@ -183,23 +260,28 @@ def ob_hist_spddirqc(ob_spd,ob_dir,ob_qc,spd_rng,dir_rng,figax1,figax2,figax3):
     ax=figax1
     ax.set_theta_zero_location('S')
     ax.set_theta_direction(-1)
-    h,x=np.histogram(ob_dir,dir_rng)
+    # the direction bins are uniform, so counts come from _uniform_hist rather
+    # than np.histogram's generic searchsorted path over the bin-edge array
     dx=dir_rng[1]-dir_rng[0]
-    xc=0.5*(x[0:-1]+x[1:])
+    h=_uniform_hist(ob_dir,dir_rng)
+    xc=0.5*(dir_rng[0:-1]+dir_rng[1:])
     ax.bar(x=xc, height=h, width=0.75*dx*np.pi/180.,facecolor='#00B143',edgecolor='w')
     ax.set_title('wind direction')
     # Generate speed histogram
     ax=figax2
-    ax.hist(ob_spd,spd_rng,facecolor='#CC00E8',edgecolor='w')
     dx=spd_rng[1]-spd_rng[0]
+    h=_uniform_hist(ob_spd,spd_rng)
+    ax.bar(0.5*(spd_rng[0:-1]+spd_rng[1:]),h,width=dx,facecolor='#CC00E8',edgecolor='w')
     ax.set_xlim((0.,np.max(ob_spd)+dx))
     ax.set_title('wind speed')
     # Generate pi-chart
     ax=figax3
     labels=['pass pre-QC','fail pre-QC']
-    y=np.where(np.isnan(ob_qc)==False)
-    if (np.size(y)>0):
-        sizes=[np.size(np.where(ob_qc[y]>0.)),np.size(np.where(ob_qc[y]<0.))]
+    # count pass/fail via boolean-mask reductions, which avoids materializing
+    # index arrays just to measure their size
+    valid=~np.isnan(ob_qc)
+    if (np.count_nonzero(valid)>0):
+        sizes=[int(np.count_nonzero(valid & (ob_qc>0.))),int(np.count_nonzero(valid & (ob_qc<0.)))]
         ax.pie(sizes, labels=labels, autopct='%1.1f%%',shadow=False, startangle=90,colors=['#00C5FF','#FF2D2D'])
         ax.axis('equal')
         ax.set_title('pre-QC check')
@@ -220,11 +302,6 @@ def stage_scorecard(ob_lat,ob_lon,ob_pre,ob_spd,ob_dir,ob_qc):
     #   fighdl: figure handle containing plot
     # DEPENDENCIES: matplotlib, ob_density_plot, ob_hist_latlonpre, ob_hist_spddirqc
     #
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import matplotlib.cm as cm
-    import cartopy.crs as ccrs
-    import cartopy.feature as cfeature
     # Outer figure domain
     figax=plt.figure(figsize=(21,14))
     # Split figure into a 2-col, 1-row set of subfigures
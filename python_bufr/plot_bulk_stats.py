@@ -42,11 +42,10 @@ for tankName in tankNameList:
     # stage data for plotting
     lat = amvDict['latitude']
     lon = amvDict['longitude']  # needs to be fixed to 0 to 360 format
-    fix = np.where(lon < 0.)
-    lon[fix] = lon[fix] + 360.
+    lon[lon < 0.] += 360.
     pre = amvDict['pressure']
     wspd = amvDict['windSpeed']
-    wdir = amvDict['windDirection'].astype('float')  # needs to be asserted as float
+    wdir = amvDict['windDirection'].astype(np.float64, copy=False)  # needs to be asserted as float; copy=False skips the copy when already float
     qc = amvDict['preQC']
     # generate scorecard figures
     obDensityFig, obHistLatLonPreFig, obHistSpdDirQCFig = bulk_stats_dependencies.stage_scorecard( ob_lat=lat,
@@ -59,7 +58,7 @@ for tankName in tankNameList:
     # report ob-types
     typ = amvDict['observationType']
     for t in np.unique(typ):
-        n = np.size(np.where(typ==t))
+        n = int((typ==t).sum())
         print('{:d} observations of Type={:d}'.format(n, t))
     # save scorecard figures
     obDensityFig.savefig(tankName + '_density.png', bbox_inches='tight', facecolor='white')
@@ -1,558 +1,120 @@
-# bufr_query: make a stack of BUFR queries and return resultSet object containing data
-#
-# INPUTS:
-#    bufrFile: full-path to BUFR file (string)
-#    queryDict: dictionary with keys as query-strings and values as variable-names (dict)
-#
-# OUTPUTS:
-#    r: resultSet object from BUFR query
-#
-# DEPENDENCIES:
-#    bufr
-def bufr_query(bufrFile, queryDict):
-    import bufr
-    # define a bufr.QuerySet() object
-    q = bufr.QuerySet()
-    # loop through queryDict key-value pairs and add them to QuerySet
-    for key in list(queryDict.keys()):
-       q.add(queryDict[key], key)
-    # safe-open bufrFile and execute query
-    with bufr.File(bufrFile) as f:
-        r = f.execute(q)
-    # return resultSet object
-    return r
-
-
-# process_NC005030: draws NC005030 observations (GOES LWIR AMVs) from BUFR file, and returns
-#                   variables based on entries in returnDict.
-#
-# INPUTS:
-#    bufrFileName: full-path to BUFR file (string)
-#    returnDict: dictionary with key/value pairs representing
-#                    keys: BUFR query (string)
-#                    values: variable name (string)
-#
-# OUTPUTS:
-#    outputDict: dictionary with key/value pairs representing
-#                    keys: variable name (string)
-#                    values: vector of values (numpy vector)
-#
-# DEPENDENCIES:
-#    numpy
-#    bufr
-#    bufr_query (above)
-def process_NC005030(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
-    #
-    # define internal functions
-    #
-    # pre_qc: perform pre-QC checks on input data, return indices of pass/fail obs
-    #
-    # INPUTS:
-    #    pre: pressure, float(nobs,), hPa
-    #    spd: wind speed, float(nobs,), m/s
-    #    zen: zenith, angle float(nobs,), deg
-    #    qin: quality indicator w/o forecast, int(nobs,), 0-100 index
-    #    cov: coefficient of variation, float(nobs,), fractional coefficient
-    #    exp: expected error, float(nobs,), m/s packed into 10. - 0.1*exp format
-    #
-    # OUTPUTS:
-    #    idxPass: indices of observations passing all checks
-    #    idxFail: indices of observations failing at least one check
-    #
-    # DEPENDENCIES:
-    #    numpy
-    def pre_qc(pre, spd, zen, qin, cov, exp):
-        import numpy as np
-        # generate vector of all indices and copy to idxPass
-        idxAll = np.arange(np.size(pre))
-        idxPass = np.copy(idxAll)
-        # zenith angle check
-        angMax = 68.
-        checkPass = np.where(zen <= angMax)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail zenith angle check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # quality indicator check
-        qiMin = 90
-        qiMax = 100
-        checkPass = np.where((qin >= qiMin) & (qin <= qiMax))
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail quality indicator check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # pressure check
-        preMin = 15000.
-        checkPass = np.where(pre >= preMin)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail pressure check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # coefficient of variation check
-        covMin = 0.04
-        covMax = 0.50
-        checkPass = np.where((cov >= covMin) & (cov <= covMax))
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail coefficient of variation check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # exp-errnorm check
-        expErrNorm = 100. * np.ones(np.size(exp,))
-        speedExists = np.where(spd > 0.1)
-        expErrNorm[speedExists] = np.divide(10. - 0.1*exp[speedExists], spd[speedExists])
-        eeMax = 0.9
-        checkPass = np.where(expErrNorm <= eeMax)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail exp-errnorm check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # define idxFail as all indices not in idxPass
-        idxFail = np.setdiff1d(idxAll, idxPass)
-        print('{:d} OBSERVATIONS FAIL ALL QC, {:d} PASS'.format(np.size(idxFail), np.size(idxPass)))
-        # return
-        return idxPass, idxFail
-    
-    #
-    # begin
-    #
-    # define dictionary of query/variable key/value pairs needed for pre_qc()
-    queryDict = {
-                 'NC005030/PRLC[1]'     : 'pressure',               # (nobs,) dimension, there are multiple copies of PRLC but should all be identical
-                 'NC005030/WSPD'        : 'windSpeed',              # (nobs,) dimension
-                 'NC005030/SAZA'        : 'zenithAngle',            # (nobs,) dimension
-                 'NC005030/AMVQIC/PCCF' : 'QIEE',                   # (nobs,4) dimension, GSI uses AMVQIC(2,2), so I will draw [:,1] here
-                                                                    #                     GSI uses AMVQIC(2,4) for expectedError, so I will draw [:,3] here
-                 'NC005030/AMVIVR/CVWD' : 'coefficientOfVariation'  # (nobs,2) dimension, GSI uses AMVIVR(2,1), so I will draw [:,0] here
-                }
-    # merge this dictionary with returnDict, defaulting to these values where appropriate
-    mergedDict = returnDict.copy()
-    mergedDict.update(queryDict)
-    # initialize empty arrays for each pre-QC variable
-    pressure               = np.asarray([])
-    windSpeed              = np.asarray([])
-    zenithAngle            = np.asarray([])
-    qualityIndicator       = np.asarray([])
-    expectedError          = np.asarray([])
-    coefficientOfVariation = np.asarray([])
-    # obtain resultSet from bufr_query()
-    resultSet = bufr_query(bufrFileName, mergedDict)
-    # loop through keys, extract array from resultSet and append to appropriate variable array
-    # and/or outputDict as appropriate. This is done on a per-variable basis, because some
-    # variables are packed together into multi-dimensional arrays and need to be split apart
-    # to be sent to separate obs vectors. If you have a variable you want passed along to outputDict
-    # that is one of these special cases, include it as a special case below.
-    #
-    # these are all handled as appends to an initially empty obs vector, since you could have multiple
-    # individual queries point to the same output variable, e.g.: latitudes from multiple BUFR tanks
-    # all pulled into a single 'latitude' obs vector.
-    outputDict = {}
-    for varName in list(returnDict.values()):
-        outputDict[varName] = np.asarray([])
-    for key in list(mergedDict.keys()):
-        print('processing '+ key + '...')
-        x = resultSet.get(mergedDict[key])
-        if mergedDict[key] == 'pressure':
-            pressure = np.append(pressure, x)
-            if 'pressure' in list(returnDict.values()):
-                outputDict['pressure'] = np.append(outputDict['pressure'], x)
-        elif mergedDict[key] == 'windSpeed':
-            windSpeed = np.append(windSpeed, x)
-            if 'windSpeed' in list(returnDict.values()):
-                outputDict['windSpeed'] = np.append(outputDict['windSpeed'], x)
-        elif mergedDict[key] == 'zenithAngle':
-            zenithAngle = np.append(zenithAngle, x)
-            if 'zenithAngle' in list(returnDict.values()):
-                outputDict['zenithAngle'] = np.append(outputDict['zenithAngle'], x)
-        elif mergedDict[key] == 'QIEE':
-            qualityIndicator = np.append(qualityIndicator, x[:,1].squeeze())
-            expectedError = np.append(expectedError, x[:,3].squeeze())
-            if 'qualityIndicator' in list(returnDict.values()):
-                outputDict['qualityIndicator'] = np.append(outputDict['qualityIndicator'], x[:,1].squeeze())
-            if 'expectedError' in list(returnDict.values()):
-                outputDict['expectedError'] = np.append(outputDict['expectedError'], x[:,3].squeeze())
-        elif mergedDict[key] == 'coefficientOfVariation':
-            coefficientOfVariation = np.append(coefficientOfVariation, x[:,0].squeeze())
-            if 'coefficientOfVariation' in list(returnDict.values()):
-                outputDict['coefficientOfVariation'] = np.append(outputDict['coefficientOfVariation'], x[:,0].squeeze())
-        else:
-            # all variables in mergedDict not in queryDict, assumed to be simple variables with no
-            # unpacking of multi-dimensional arrays necessary, but if any special cases exist feel free
-            # to add them here if they aren't already a pre-QC variable in queryDict
-            print('key: ' + key + ' is NOT a pre-QC key')
-            if mergedDict[key] in list(returnDict.values()):
-                outputDict[mergedDict[key]] = np.append(outputDict[mergedDict[key]], x)
-    # perform pre-QC checks
-    idxPass, idxFail = pre_qc(pre=pressure,
-                              spd=windSpeed,
-                              zen=zenithAngle,
-                              qin=qualityIndicator,
-                              cov=coefficientOfVariation,
-                              exp=expectedError)
-    print(np.size(idxFail), np.size(idxPass))
-    # create a preQC variable with 1==pass, -1==fail
-    preQC = -1 * np.ones((np.size(idxPass) + np.size(idxFail),), dtype='int')
-    preQC[idxPass] = 1
-    # append preQC to outputDict
-    outputDict['preQC'] = preQC
-    # create a obType variable and assign all values to 245
-    obType = 245 * np.ones(np.shape(preQC), dtype='int')
-    # append obType to outputDict
-    outputDict['observationType'] = obType
-    # return outputDict
-    return outputDict
-    #
-    # end
-    #
-
-
-# process_NC005031: draws NC005031 observations (GOES WVDL AMVs) from BUFR file, and returns
-#                   variables based on entries in returnDict.
-#
-# INPUTS:
-#    bufrFileName: full-path to BUFR file (string)
-#    returnDict: dictionary with key/value pairs representing
-#                    keys: BUFR query (string)
-#                    values: variable name (string)
-#
-# OUTPUTS:
-#    outputDict: dictionary with key/value pairs representing
-#                    keys: variable name (string)
-#                    values: vector of values (numpy vector)
-#
-# DEPENDENCIES:
-#    numpy
-#    bufr
-#    bufr_query (above)
-def process_NC005031(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
-    #
-    # define internal functions
-    #
-    # pre_qc: perform pre-QC checks on input data, return indices of pass/fail obs
-    #
-    # INPUTS:
-    #    pre: pressure, float(nobs,), hPa
-    #    spd: wind speed, float(nobs,), m/s
-    #    zen: zenith, angle float(nobs,), deg
-    #    qin: quality indicator w/o forecast, int(nobs,), 0-100 index
-    #    exp: expected error, float(nobs,), m/s packed into 10. - 0.1*exp format
-    #
-    # OUTPUTS:
-    #    idxPass: indices of observations passing all checks
-    #    idxFail: indices of observations failing at least one check
-    #
-    # DEPENDENCIES:
-    #    numpy
-    def pre_qc(pre, spd, zen, qin, exp):
-        import numpy as np
-        # generate vector of all indices and copy to idxPass
-        idxAll = np.arange(np.size(pre))
-        idxPass = np.copy(idxAll)
-        # zenith angle check
-        angMax = 68.
-        checkPass = np.where(zen <= angMax)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail zenith angle check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # quality indicator check
-        qiMin = 90
-        qiMax = 100
-        checkPass = np.where((qin >= qiMin) & (qin <= qiMax))
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail quality indicator check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # pressure check
-        preMin = 15000.
-        checkPass = np.where(pre >= preMin)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail pressure check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # exp-errnorm check
-        expErrNorm = 100. * np.ones(np.size(exp,))
-        speedExists = np.where(spd > 0.1)
-        expErrNorm[speedExists] = np.divide(10. - 0.1*exp[speedExists], spd[speedExists])
-        eeMax = 0.9
-        checkPass = np.where(expErrNorm <= eeMax)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail exp-errnorm check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # define idxFail as all indices not in idxPass
-        idxFail = np.setdiff1d(idxAll, idxPass)
-        print('{:d} OBSERVATIONS FAIL ALL QC, {:d} PASS'.format(np.size(idxFail), np.size(idxPass)))
-        # return
-        return idxPass, idxFail
-    
-    #
-    # begin
-    #
-    # define dictionary of query/variable key/value pairs needed for pre_qc()
-    queryDict = {
-                 'NC005031/PRLC[1]'     : 'pressure',               # (nobs,) dimension, there are multiple copies of PRLC but should all be identical
-                 'NC005031/WSPD'        : 'windSpeed',              # (nobs,) dimension
-                 'NC005031/SAZA'        : 'zenithAngle',            # (nobs,) dimension
-                 'NC005031/AMVQIC/PCCF' : 'QIEE'                    # (nobs,4) dimension, GSI uses AMVQIC(2,2), so I will draw [:,1] here
-                                                                    #                     GSI uses AMVQIC(2,4) for expectedError, so I will draw [:,3] here
-                }
-    # merge this dictionary with returnDict, defaulting to these values where appropriate
-    mergedDict = returnDict.copy()
-    mergedDict.update(queryDict)
-    # initialize empty arrays for each pre-QC variable
-    pressure               = np.asarray([])
-    windSpeed              = np.asarray([])
-    zenithAngle            = np.asarray([])
-    qualityIndicator       = np.asarray([])
-    expectedError          = np.asarray([])
-    # obtain resultSet from bufr_query()
-    resultSet = bufr_query(bufrFileName, mergedDict)
-    # loop through keys, extract array from resultSet and append to appropriate variable array
-    # and/or outputDict as appropriate. This is done on a per-variable basis, because some
-    # variables are packed together into multi-dimensional arrays and need to be split apart
-    # to be sent to separate obs vectors. If you have a variable you want passed along to outputDict
-    # that is one of these special cases, include it as a special case below.
-    #
-    # these are all handled as appends to an initially empty obs vector, since you could have multiple
-    # individual queries point to the same output variable, e.g.: latitudes from multiple BUFR tanks
-    # all pulled into a single 'latitude' obs vector.
-    outputDict = {}
-    for varName in list(returnDict.values()):
-        outputDict[varName] = np.asarray([])
-    for key in list(mergedDict.keys()):
-        print('processing '+ key + '...')
-        x = resultSet.get(mergedDict[key])
-        if mergedDict[key] == 'pressure':
-            pressure = np.append(pressure, x)
-            if 'pressure' in list(returnDict.values()):
-                outputDict['pressure'] = np.append(outputDict['pressure'], x)
-        elif mergedDict[key] == 'windSpeed':
-            windSpeed = np.append(windSpeed, x)
-            if 'windSpeed' in list(returnDict.values()):
-                outputDict['windSpeed'] = np.append(outputDict['windSpeed'], x)
-        elif mergedDict[key] == 'zenithAngle':
-            zenithAngle = np.append(zenithAngle, x)
-            if 'zenithAngle' in list(returnDict.values()):
-                outputDict['zenithAngle'] = np.append(outputDict['zenithAngle'], x)
-        elif mergedDict[key] == 'QIEE':
-            qualityIndicator = np.append(qualityIndicator, x[:,1].squeeze())
-            expectedError = np.append(expectedError, x[:,3].squeeze())
-            if 'qualityIndicator' in list(returnDict.values()):
-                outputDict['qualityIndicator'] = np.append(outputDict['qualityIndicator'], x[:,1].squeeze())
-            if 'expectedError' in list(returnDict.values()):
-                outputDict['expectedError'] = np.append(outputDict['expectedError'], x[:,3].squeeze())
-        else:
-            # all variables in mergedDict not in queryDict, assumed to be simple variables with no
-            # unpacking of multi-dimensional arrays necessary, but if any special cases exist feel free
-            # to add them here if they aren't already a pre-QC variable in queryDict
-            print('key: ' + key + ' is NOT a pre-QC key')
-            if mergedDict[key] in list(returnDict.values()):
-                outputDict[mergedDict[key]] = np.append(outputDict[mergedDict[key]], x)
-    # perform pre-QC checks
-    idxPass, idxFail = pre_qc(pre=pressure,
-                              spd=windSpeed,
-                              zen=zenithAngle,
-                              qin=qualityIndicator,
-                              exp=expectedError)
-    print(np.size(idxFail), np.size(idxPass))
-    # create a preQC variable with 1==pass, -1==fail
-    preQC = -1 * np.ones((np.size(idxPass) + np.size(idxFail),), dtype='int')
-    preQC[idxPass] = 1
-    # append preQC to outputDict
-    outputDict['preQC'] = preQC
-    # create a obType variable and assign all values to 247
-    obType = 247 * np.ones(np.shape(preQC), dtype='int')
-    # append obType to outputDict
-    outputDict['observationType'] = obType
-    # return outputDict
-    return outputDict
-    #
-    # end
-    #
-
-
-# process_NC005032: draws NC005032 observations (GOES VIS AMVs) from BUFR file, and returns
-#                   variables based on entries in returnDict.
-#
-# INPUTS:
-#    bufrFileName: full-path to BUFR file (string)
-#    returnDict: dictionary with key/value pairs representing
-#                    keys: BUFR query (string)
-#                    values: variable name (string)
-#
-# OUTPUTS:
-#    outputDict: dictionary with key/value pairs representing
-#                    keys: variable name (string)
-#                    values: vector of values (numpy vector)
-#
-# DEPENDENCIES:
-#    numpy
-#    bufr
-#    bufr_query (above)
-def process_NC005032(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
-    #
-    # define internal functions
-    #
-    # pre_qc: perform pre-QC checks on input data, return indices of pass/fail obs
-    #
-    # INPUTS:
-    #    pre: pressure, float(nobs,), hPa
-    #    spd: wind speed, float(nobs,), m/s
-    #    zen: zenith, angle float(nobs,), deg
-    #    qin: quality indicator w/o forecast, int(nobs,), 0-100 index
-    #    cov: coefficient of variation, float(nobs,), fractional coefficient
-    #    exp: expected error, float(nobs,), m/s packed into 10. - 0.1*exp format
-    #
-    # OUTPUTS:
-    #    idxPass: indices of observations passing all checks
-    #    idxFail: indices of observations failing at least one check
-    #
-    # DEPENDENCIES:
-    #    numpy
-    def pre_qc(pre, spd, zen, qin, cov, exp):
-        import numpy as np
-        # generate vector of all indices and copy to idxPass
-        idxAll = np.arange(np.size(pre))
-        idxPass = np.copy(idxAll)
-        # zenith angle check
-        angMax = 68.
-        checkPass = np.where(zen <= angMax)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail zenith angle check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # quality indicator check
-        qiMin = 90
-        qiMax = 100
-        checkPass = np.where((qin >= qiMin) & (qin <= qiMax))
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail quality indicator check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # pressure check (preMin=70000. cutoff for VIS winds)
-        preMin = 70000.
-        checkPass = np.where(pre >= preMin)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail pressure check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # coefficient of variation check
-        covMin = 0.04
-        covMax = 0.50
-        checkPass = np.where((cov >= covMin) & (cov <= covMax))
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail coefficient of variation check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # exp-errnorm check
-        expErrNorm = 100. * np.ones(np.size(exp,))
-        speedExists = np.where(spd > 0.1)
-        expErrNorm[speedExists] = np.divide(10. - 0.1*exp[speedExists], spd[speedExists])
-        eeMax = 0.9
-        checkPass = np.where(expErrNorm <= eeMax)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail exp-errnorm check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # define idxFail as all indices not in idxPass
-        idxFail = np.setdiff1d(idxAll, idxPass)
-        print('{:d} OBSERVATIONS FAIL ALL QC, {:d} PASS'.format(np.size(idxFail), np.size(idxPass)))
-        # return
-        return idxPass, idxFail
-    
-    #
-    # begin
-    #
-    # define dictionary of query/variable key/value pairs needed for pre_qc()
-    queryDict = {
-                 'NC005032/PRLC[1]'     : 'pressure',               # (nobs,) dimension, there are multiple copies of PRLC but should all be identical
-                 'NC005032/WSPD'        : 'windSpeed',              # (nobs,) dimension
-                 'NC005032/SAZA'        : 'zenithAngle',            # (nobs,) dimension
-                 'NC005032/AMVQIC/PCCF' : 'QIEE',                   # (nobs,4) dimension, GSI uses AMVQIC(2,2), so I will draw [:,1] here
-                                                                    #                     GSI uses AMVQIC(2,4) for expectedError, so I will draw [:,3] here
-                 'NC005032/AMVIVR/CVWD' : 'coefficientOfVariation'  # (nobs,2) dimension, GSI uses AMVIVR(2,1), so I will draw [:,0] here
-                }
-    # merge this dictionary with returnDict, defaulting to these values where appropriate
-    mergedDict = returnDict.copy()
-    mergedDict.update(queryDict)
-    # initialize empty arrays for each pre-QC variable
-    pressure               = np.asarray([])
-    windSpeed              = np.asarray([])
-    zenithAngle            = np.asarray([])
-    qualityIndicator       = np.asarray([])
-    expectedError          = np.asarray([])
-    coefficientOfVariation = np.asarray([])
-    # obtain resultSet from bufr_query()
-    resultSet = bufr_query(bufrFileName, mergedDict)
-    # loop through keys, extract array from resultSet and append to appropriate variable array
-    # and/or outputDict as appropriate. This is done on a per-variable basis, because some
-    # variables are packed together into multi-dimensional arrays and need to be split apart
-    # to be sent to separate obs vectors. If you have a variable you want passed along to outputDict
-    # that is one of these special cases, include it as a special case below.
-    #
-    # these are all handled as appends to an initially empty obs vector, since you could have multiple
-    # individual queries point to the same output variable, e.g.: latitudes from multiple BUFR tanks
-    # all pulled into a single 'latitude' obs vector.
-    outputDict = {}
-    for varName in list(returnDict.values()):
-        outputDict[varName] = np.asarray([])
-    for key in list(mergedDict.keys()):
-        print('processing '+ key + '...')
-        x = resultSet.get(mergedDict[key])
-        if mergedDict[key] == 'pressure':
-            pressure = np.append(pressure, x)
-            if 'pressure' in list(returnDict.values()):
-                outputDict['pressure'] = np.append(outputDict['pressure'], x)
-        elif mergedDict[key] == 'windSpeed':
-            windSpeed = np.append(windSpeed, x)
-            if 'windSpeed' in list(returnDict.values()):
-                outputDict['windSpeed'] = np.append(outputDict['windSpeed'], x)
-        elif mergedDict[key] == 'zenithAngle':
-            zenithAngle = np.append(zenithAngle, x)
-            if 'zenithAngle' in list(returnDict.values()):
-                outputDict['zenithAngle'] = np.append(outputDict['zenithAngle'], x)
-        elif mergedDict[key] == 'QIEE':
-            qualityIndicator = np.append(qualityIndicator, x[:,1].squeeze())
-            expectedError = np.append(expectedError, x[:,3].squeeze())
-            if 'qualityIndicator' in list(returnDict.values()):
-                outputDict['qualityIndicator'] = np.append(outputDict['qualityIndicator'], x[:,1].squeeze())
-            if 'expectedError' in list(returnDict.values()):
-                outputDict['expectedError'] = np.append(outputDict['expectedError'], x[:,3].squeeze())
-        elif mergedDict[key] == 'coefficientOfVariation':
-            coefficientOfVariation = np.append(coefficientOfVariation, x[:,0].squeeze())
-            if 'coefficientOfVariation' in list(returnDict.values()):
-                outputDict['coefficientOfVariation'] = np.append(outputDict['coefficientOfVariation'], x[:,0].squeeze())
-        else:
-            # all variables in mergedDict not in queryDict, assumed to be simple variables with no
-            # unpacking of multi-dimensional arrays necessary, but if any special cases exist feel free
-            # to add them here if they aren't already a pre-QC variable in queryDict
-            print('key: ' + key + ' is NOT a pre-QC key')
-            if mergedDict[key] in list(returnDict.values()):
-                outputDict[mergedDict[key]] = np.append(outputDict[mergedDict[key]], x)
-    # perform pre-QC checks
-    idxPass, idxFail = pre_qc(pre=pressure,
-                              spd=windSpeed,
-                              zen=zenithAngle,
-                              qin=qualityIndicator,
-                              cov=coefficientOfVariation,
-                              exp=expectedError)
-    print(np.size(idxFail), np.size(idxPass))
-    # create a preQC variable with 1==pass, -1==fail
-    preQC = -1 * np.ones((np.size(idxPass) + np.size(idxFail),), dtype='int')
-    preQC[idxPass] = 1
-    # append preQC to outputDict
-    outputDict['preQC'] = preQC
-    # create a obType variable and assign all values to 251
-    obType = 251 * np.ones(np.shape(preQC), dtype='int')
-    # append obType to outputDict
-    outputDict['observationType'] = obType
-    # return outputDict
-    return outputDict
+import numpy as np
+import bufr
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# diagnostics from the batch-hot query/QC loops go through a module logger at
+# DEBUG level: at the default WARNING level each call costs only a level check,
+# where the prints they replace formatted and flushed stdout per key/per check
+logger = logging.getLogger(__name__)
+# numba accelerates the pre-QC kernel when available, but is optional: without it,
+# pre_qc falls back to an equivalent numpy boolean-mask pass
+try:
+    from numba import njit
+    have_numba = True
+except ImportError:
+    have_numba = False
+
+if have_numba:
+    # _preqc_goes_kernel: fused pre-QC kernel for the GOES-style processors
     #
-    # end
+    # Evaluates all five checks per element in a single pass, so the comparisons and
+    # the expected-error normalization happen in registers with no N-element
+    # temporaries. Kept serial rather than parallel since the per-check pass
+    # counters would race under a parallel loop.
     #
+    # INPUTS: obs vectors (pre, spd, zen, qin, cov, exp) and check thresholds
+    # OUTPUTS:
+    #    passMask: boolean mask of observations passing all checks
+    #    nPassChecks: per-check pass counts (5-vector, for diagnostic prints)
+    @njit(cache=True)
+    def _preqc_goes_kernel(pre, spd, zen, qin, cov, exp, angMax, qiMin, qiMax, preMin, preMax, covMin, covMax, eeMax):
+        nobs = pre.size
+        passMask = np.ones(nobs, dtype=np.bool_)
+        nPassChecks = np.zeros(5, dtype=np.int64)
+        for i in range(nobs):
+            zenOk = zen[i] <= angMax
+            qinOk = (qin[i] >= qiMin) and (qin[i] <= qiMax)
+            preOk = (pre[i] >= preMin) and (pre[i] <= preMax)
+            covOk = (cov[i] >= covMin) and (cov[i] <= covMax)
+            # multiply-through form of (10. - 0.1*exp)/spd <= eeMax (spd > 0.1 > 0)
+            eeOk = (spd[i] > 0.1) and ((10. - 0.1 * exp[i]) <= eeMax * spd[i])
+            if zenOk: nPassChecks[0] += 1
+            if qinOk: nPassChecks[1] += 1
+            if preOk: nPassChecks[2] += 1
+            if covOk: nPassChecks[3] += 1
+            if eeOk:  nPassChecks[4] += 1
+            passMask[i] = zenOk and qinOk and preOk and covOk and eeOk
+        return passMask, nPassChecks
 
+    # _preqc_goes_nocov_kernel: as _preqc_goes_kernel, for processors without a
+    # coefficient-of-variation check (NC005031 WVDL winds)
+    @njit(cache=True)
+    def _preqc_goes_nocov_kernel(pre, spd, zen, qin, exp, angMax, qiMin, qiMax, preMin, preMax, eeMax):
+        nobs = pre.size
+        passMask = np.ones(nobs, dtype=np.bool_)
+        nPassChecks = np.zeros(4, dtype=np.int64)
+        for i in range(nobs):
+            zenOk = zen[i] <= angMax
+            qinOk = (qin[i] >= qiMin) and (qin[i] <= qiMax)
+            preOk = (pre[i] >= preMin) and (pre[i] <= preMax)
+            # multiply-through form of (10. - 0.1*exp)/spd <= eeMax (spd > 0.1 > 0)
+            eeOk = (spd[i] > 0.1) and ((10. - 0.1 * exp[i]) <= eeMax * spd[i])
+            if zenOk: nPassChecks[0] += 1
+            if qinOk: nPassChecks[1] += 1
+            if preOk: nPassChecks[2] += 1
+            if eeOk:  nPassChecks[3] += 1
+            passMask[i] = zenOk and qinOk and preOk and eeOk
+        return passMask, nPassChecks
 
-# process_NC005034: draws NC005034 observations (GOES WVCT AMVs) from BUFR file, and returns
-#                   variables based on entries in returnDict.
+
+# bufr_query: make a stack of BUFR queries and return resultSet object containing data
+#
+# INPUTS:
+#    bufrFile: full-path to BUFR file (string)
+#    queryDict: dictionary with keys as query-strings and values as variable-names (dict)
+#
+# OUTPUTS:
+#    r: resultSet object from BUFR query
+#
+# DEPENDENCIES:
+#    bufr
+def bufr_query(bufrFile, queryDict):
+    # define a bufr.QuerySet() object
+    q = bufr.QuerySet()
+    # loop through queryDict key-value pairs and add them to QuerySet: items()
+    # yields both halves of each pair without the key-list allocation and the
+    # per-iteration dict lookup
+    for queryStr, varName in queryDict.items():
+       q.add(varName, queryStr)
+    # safe-open bufrFile and execute query
+    with bufr.File(bufrFile) as f:
+        r = f.execute(q)
+    # return resultSet object
+    return r
+
+
+# _process_goes_tank: shared implementation behind the GOES-style AMV processors
+#                      (NC005030 LWIR / NC005031 WVDL / NC005032 VIS /
+#                      NC005034 WVCT). The
+#                      tanks run the same query/dispatch/pre-QC pipeline and differ
+#                      only in tank prefix, pressure cutoff, presence of the
+#                      coefficient-of-variation check, and report ob-type, so the
+#                      pipeline lives here once and the per-tank entry points are
+#                      thin wrappers supplying qcParams.
 #
 # INPUTS:
 #    bufrFileName: full-path to BUFR file (string)
 #    returnDict: dictionary with key/value pairs representing
 #                    keys: BUFR query (string)
 #                    values: variable name (string)
+#    tank: tank name (string, NC005xxx)
+#    qcParams: dictionary of per-tank QC settings:
+#                  'preMin': minimum pressure (Pa)
+#                  'preMax': maximum pressure (Pa, np.inf when the tank has no upper cutoff)
+#                  'useCov': if True, query CVWD and apply the coefficient-of-variation check
+#                  'obType': report ob-type assigned to all observations
 #
 # OUTPUTS:
 #    outputDict: dictionary with key/value pairs representing
@@ -563,159 +125,169 @@ def process_NC005032(bufrFileName, returnDict):
 #    numpy
 #    bufr
 #    bufr_query (above)
-def process_NC005034(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
+def _process_goes_tank(bufrFileName, returnDict, tank, qcParams):
     #
     # define internal functions
     #
-    # pre_qc: perform pre-QC checks on input data, return indices of pass/fail obs
+    # pre_qc: perform pre-QC checks on input data, return pass/fail mask
     #
     # INPUTS:
     #    pre: pressure, float(nobs,), hPa
     #    spd: wind speed, float(nobs,), m/s
     #    zen: zenith, angle float(nobs,), deg
     #    qin: quality indicator w/o forecast, int(nobs,), 0-100 index
-    #    cov: coefficient of variation, float(nobs,), fractional coefficient
     #    exp: expected error, float(nobs,), m/s packed into 10. - 0.1*exp format
+    #    cov: coefficient of variation, float(nobs,), fractional coefficient
+    #         (None when the tank carries no CVWD check)
+    #    verbose: if False, suppress the diagnostic prints (for batch pipelines)
     #
     # OUTPUTS:
-    #    idxPass: indices of observations passing all checks
-    #    idxFail: indices of observations failing at least one check
+    #    passMask: boolean mask, True for observations passing all checks
     #
     # DEPENDENCIES:
     #    numpy
-    def pre_qc(pre, spd, zen, qin, cov, exp):
-        import numpy as np
-        # generate vector of all indices and copy to idxPass
-        idxAll = np.arange(np.size(pre))
-        idxPass = np.copy(idxAll)
-        # zenith angle check
-        angMax = 68.
-        checkPass = np.where(zen <= angMax)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail zenith angle check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # quality indicator check
-        qiMin = 90
+    def pre_qc(pre, spd, zen, qin, exp, cov=None, verbose=True):
+        # check thresholds
+        angMax = 68.               # zenith angle
+        qiMin = 90                 # quality indicator
         qiMax = 100
-        checkPass = np.where((qin >= qiMin) & (qin <= qiMax))
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail quality indicator check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # pressure check (preMin=15000., preMax=30000. cutoff for WVCT winds)
-        preMin = 15000.
-        preMax = 30000.
-        checkPass = np.where((pre >= preMin) & (pre <= preMax))
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail pressure check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # coefficient of variation check
-        covMin = 0.04
+        preMin = qcParams['preMin']  # pressure (per-tank band)
+        preMax = qcParams['preMax']
+        covMin = 0.04              # coefficient of variation
         covMax = 0.50
-        checkPass = np.where((cov >= covMin) & (cov <= covMax))
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail coefficient of variation check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # exp-errnorm check
-        expErrNorm = 100. * np.ones(np.size(exp,))
-        speedExists = np.where(spd > 0.1)
-        expErrNorm[speedExists] = np.divide(10. - 0.1*exp[speedExists], spd[speedExists])
-        eeMax = 0.9
-        checkPass = np.where(expErrNorm <= eeMax)
-        checkFail = np.setdiff1d(idxAll, checkPass)
-        idxPass = np.setdiff1d(idxPass, checkFail)
-        print('{:d} observations fail exp-errnorm check, {:d} pass'.format(np.size(checkFail), np.size(checkPass)))
-        # define idxFail as all indices not in idxPass
-        idxFail = np.setdiff1d(idxAll, idxPass)
-        print('{:d} OBSERVATIONS FAIL ALL QC, {:d} PASS'.format(np.size(idxFail), np.size(idxPass)))
+        eeMax = 0.9                # exp-errnorm
+        useCov = cov is not None
+        nobs = pre.size
+        if have_numba:
+            # fused kernel: all checks evaluated per element in one pass
+            if useCov:
+                passMask, nPassChecks = _preqc_goes_kernel(pre, spd, zen, qin, cov, exp,
+                                                           angMax, qiMin, qiMax, preMin, preMax, covMin, covMax, eeMax)
+            else:
+                passMask, nPassChecks = _preqc_goes_nocov_kernel(pre, spd, zen, qin, exp,
+                                                                 angMax, qiMin, qiMax, preMin, preMax, eeMax)
+        else:
+            # numpy fallback: each check produces a boolean mask which is ANDed
+            # into a cumulative pass-mask
+            checkMasks = [(zen <= angMax),
+                          (qin >= qiMin) & (qin <= qiMax),
+                          (pre >= preMin) & (pre <= preMax)]
+            if useCov:
+                checkMasks.append((cov >= covMin) & (cov <= covMax))
+            # multiply-through form of (10. - 0.1*exp)/spd <= eeMax: equivalent since
+            # the predicate requires spd > 0.1 > 0, and obs with slower speeds fail
+            # the check anyway; avoids the division and the scratch expErrNorm vector
+            checkMasks.append((spd > 0.1) & ((10. - 0.1*exp) <= eeMax*spd))
+            # reduce over the check masks pairwise without intermediate named temporaries
+            passMask = np.logical_and.reduce(checkMasks)
+            nPassChecks = [np.count_nonzero(m) for m in checkMasks]
+        # report per-check pass/fail counts in one batch after the compute, rather
+        # than interleaving I/O with the checks; the counts are only formatted
+        # when DEBUG logging is live
+        if verbose and logger.isEnabledFor(logging.DEBUG):
+            checkNames = ['zenith angle', 'quality indicator', 'pressure']
+            if useCov:
+                checkNames.append('coefficient of variation')
+            checkNames.append('exp-errnorm')
+            for checkName, nPass in zip(checkNames, nPassChecks):
+                logger.debug('%d observations fail %s check, %d pass', nobs - int(nPass), checkName, int(nPass))
+            nPassAll = int(np.count_nonzero(passMask))
+            logger.debug('%d OBSERVATIONS FAIL ALL QC, %d PASS', nobs - nPassAll, nPassAll)
+        # return the cumulative mask: callers mask-index with it directly, which
+        # avoids materializing index arrays just to fancy-index later
         # return
-        return idxPass, idxFail
+        return passMask
     
     #
     # begin
     #
     # define dictionary of query/variable key/value pairs needed for pre_qc()
     queryDict = {
-                 'NC005034/PRLC[1]'     : 'pressure',               # (nobs,) dimension, there are multiple copies of PRLC but should all be identical
-                 'NC005034/WSPD'        : 'windSpeed',              # (nobs,) dimension
-                 'NC005034/SAZA'        : 'zenithAngle',            # (nobs,) dimension
-                 'NC005034/AMVQIC/PCCF' : 'QIEE',                   # (nobs,4) dimension, GSI uses AMVQIC(2,2), so I will draw [:,1] here
-                                                                    #                     GSI uses AMVQIC(2,4) for expectedError, so I will draw [:,3] here
-                 'NC005034/AMVIVR/CVWD' : 'coefficientOfVariation'  # (nobs,2) dimension, GSI uses AMVIVR(2,1), so I will draw [:,0] here
+                 tank + '/PRLC[1]'     : 'pressure',               # (nobs,) dimension, there are multiple copies of PRLC but should all be identical
+                 tank + '/WSPD'        : 'windSpeed',              # (nobs,) dimension
+                 tank + '/SAZA'        : 'zenithAngle',            # (nobs,) dimension
+                 tank + '/AMVQIC/PCCF' : 'QIEE'                    # (nobs,4) dimension, GSI uses AMVQIC(2,2), so I will draw [:,1] here
+                                                                   #                     GSI uses AMVQIC(2,4) for expectedError, so I will draw [:,3] here
                 }
-    # merge this dictionary with returnDict, defaulting to these values where appropriate
-    mergedDict = returnDict.copy()
+    if qcParams['useCov']:
+        queryDict[tank + '/AMVIVR/CVWD'] = 'coefficientOfVariation'  # (nobs,2) dimension, GSI uses AMVIVR(2,1), so I will draw [:,0] here
+    # merge this dictionary with returnDict, defaulting to these values where
+    # appropriate. returnDict entries that request a pre-QC variable under a
+    # different query string are dropped: keeping them would add a second decode
+    # of the same field to the QuerySet under a colliding variable name
+    queryVarNames = set(queryDict.values())
+    mergedDict = {queryStr: varName for queryStr, varName in returnDict.items()
+                  if varName not in queryVarNames}
     mergedDict.update(queryDict)
-    # initialize empty arrays for each pre-QC variable
-    pressure               = np.asarray([])
-    windSpeed              = np.asarray([])
-    zenithAngle            = np.asarray([])
-    qualityIndicator       = np.asarray([])
-    expectedError          = np.asarray([])
-    coefficientOfVariation = np.asarray([])
     # obtain resultSet from bufr_query()
     resultSet = bufr_query(bufrFileName, mergedDict)
-    # loop through keys, extract array from resultSet and append to appropriate variable array
-    # and/or outputDict as appropriate. This is done on a per-variable basis, because some
+    # loop through keys, extract array from resultSet and bind it to the appropriate
+    # variable and/or outputDict entry. This is done on a per-variable basis, because some
     # variables are packed together into multi-dimensional arrays and need to be split apart
     # to be sent to separate obs vectors. If you have a variable you want passed along to outputDict
     # that is one of these special cases, include it as a special case below.
     #
-    # these are all handled as appends to an initially empty obs vector, since you could have multiple
-    # individual queries point to the same output variable, e.g.: latitudes from multiple BUFR tanks
-    # all pulled into a single 'latitude' obs vector.
-    outputDict = {}
-    for varName in list(returnDict.values()):
-        outputDict[varName] = np.asarray([])
+    # a single bufr_query covers the whole tank and each variable appears exactly once,
+    # so results are bound directly; the np.append-onto-empty-vector accumulation this
+    # replaces re-allocated and copied the arrays without ever merging anything.
+    # requested variable names as a set: computed once, O(1) membership tests in
+    # the dispatch loop instead of rebuilding a list per check
+    returnVarNames = set(returnDict.values())
+    # each requested variable starts as a typed empty vector: the sentinel only
+    # survives for variables no query produced, and float32 avoids promoting any
+    # downstream concatenation with real data to float64
+    outputDict = {varName: np.empty(0, dtype=np.float32) for varName in returnVarNames}
+    # dispatch table: maps each pre-QC variable name to a handler unpacking the raw
+    # result into one or more named obs vectors, so the loop does one dict lookup
+    # per key instead of walking a string-comparison chain. The packed QIEE/CVWD
+    # columns are strided views into the 2D results; one contiguous copy apiece
+    # keeps the downstream QC scans sequential.
+    handlers = {
+                'pressure'               : lambda x: {'pressure': x},
+                'windSpeed'              : lambda x: {'windSpeed': x},
+                'zenithAngle'            : lambda x: {'zenithAngle': x},
+                'QIEE'                   : lambda x: {'qualityIndicator': np.ascontiguousarray(x[:,1]),
+                                                      'expectedError'   : np.ascontiguousarray(x[:,3])},
+                'coefficientOfVariation' : lambda x: {'coefficientOfVariation': np.ascontiguousarray(x[:,0])},
+               }
+    preQCVars = {}
     for key in list(mergedDict.keys()):
-        print('processing '+ key + '...')
-        x = resultSet.get(mergedDict[key])
-        if mergedDict[key] == 'pressure':
-            pressure = np.append(pressure, x)
-            if 'pressure' in list(returnDict.values()):
-                outputDict['pressure'] = np.append(outputDict['pressure'], x)
-        elif mergedDict[key] == 'windSpeed':
-            windSpeed = np.append(windSpeed, x)
-            if 'windSpeed' in list(returnDict.values()):
-                outputDict['windSpeed'] = np.append(outputDict['windSpeed'], x)
-        elif mergedDict[key] == 'zenithAngle':
-            zenithAngle = np.append(zenithAngle, x)
-            if 'zenithAngle' in list(returnDict.values()):
-                outputDict['zenithAngle'] = np.append(outputDict['zenithAngle'], x)
-        elif mergedDict[key] == 'QIEE':
-            qualityIndicator = np.append(qualityIndicator, x[:,1].squeeze())
-            expectedError = np.append(expectedError, x[:,3].squeeze())
-            if 'qualityIndicator' in list(returnDict.values()):
-                outputDict['qualityIndicator'] = np.append(outputDict['qualityIndicator'], x[:,1].squeeze())
-            if 'expectedError' in list(returnDict.values()):
-                outputDict['expectedError'] = np.append(outputDict['expectedError'], x[:,3].squeeze())
-        elif mergedDict[key] == 'coefficientOfVariation':
-            coefficientOfVariation = np.append(coefficientOfVariation, x[:,0].squeeze())
-            if 'coefficientOfVariation' in list(returnDict.values()):
-                outputDict['coefficientOfVariation'] = np.append(outputDict['coefficientOfVariation'], x[:,0].squeeze())
+        logger.debug('processing %s...', key)
+        varName = mergedDict[key]
+        x = resultSet.get(varName)
+        if varName in handlers:
+            extracted = handlers[varName](x)
+            preQCVars.update(extracted)
+            for name in extracted:
+                if name in returnVarNames:
+                    outputDict[name] = extracted[name]
         else:
             # all variables in mergedDict not in queryDict, assumed to be simple variables with no
             # unpacking of multi-dimensional arrays necessary, but if any special cases exist feel free
-            # to add them here if they aren't already a pre-QC variable in queryDict
-            print('key: ' + key + ' is NOT a pre-QC key')
-            if mergedDict[key] in list(returnDict.values()):
-                outputDict[mergedDict[key]] = np.append(outputDict[mergedDict[key]], x)
+            # to add them to the handlers table if they aren't already a pre-QC variable in queryDict
+            logger.debug('key: %s is NOT a pre-QC key', key)
+            if varName in returnVarNames:
+                outputDict[varName] = x
     # perform pre-QC checks
-    idxPass, idxFail = pre_qc(pre=pressure,
-                              spd=windSpeed,
-                              zen=zenithAngle,
-                              qin=qualityIndicator,
-                              cov=coefficientOfVariation,
-                              exp=expectedError)
-    print(np.size(idxFail), np.size(idxPass))
-    # create a preQC variable with 1==pass, -1==fail
-    preQC = -1 * np.ones((np.size(idxPass) + np.size(idxFail),), dtype='int')
-    preQC[idxPass] = 1
+    # the checks are elementwise compares, all memory-bound, so the obs vectors
+    # go in as float32: half the bytes through cache, and copy=False makes the
+    # casts free when the BUFR results are already single precision
+    passMask = pre_qc(pre=preQCVars['pressure'].astype(np.float32, copy=False),
+                      spd=preQCVars['windSpeed'].astype(np.float32, copy=False),
+                      zen=preQCVars['zenithAngle'].astype(np.float32, copy=False),
+                      qin=preQCVars['qualityIndicator'].astype(np.float32, copy=False),
+                      exp=preQCVars['expectedError'].astype(np.float32, copy=False),
+                      cov=preQCVars['coefficientOfVariation'].astype(np.float32, copy=False) if qcParams['useCov'] else None)
+    logger.debug('%d fail, %d pass', np.count_nonzero(~passMask), np.count_nonzero(passMask))
+    # create a preQC variable with 1==pass, -1==fail; int8 holds +/-1 in one
+    # byte per ob where the platform default int spent eight
+    preQC = np.where(passMask, np.int8(1), np.int8(-1))
     # append preQC to outputDict
     outputDict['preQC'] = preQC
-    # create a obType variable and assign all values to 246
-    obType = 246 * np.ones(np.shape(preQC), dtype='int')
+    # create a obType variable and assign all values to the tank ob-type: np.full
+    # writes the constant in a single pass (the multiply form first broadcast a
+    # float64 ones vector and then cast) and int16 is ample for the report types
+    obType = np.full(preQC.shape, qcParams['obType'], dtype=np.int16)
     # append obType to outputDict
     outputDict['observationType'] = obType
     # return outputDict
@@ -725,6 +297,100 @@ def process_NC005034(bufrFileName, returnDict):
     #
 
 
+# process_NC005030: draws NC005030 observations (GOES LWIR AMVs) from BUFR file, and returns
+#                   variables based on entries in returnDict.
+#                   thin wrapper around _process_goes_tank (see above for the
+#                   full interface description)
+#
+# INPUTS:
+#    bufrFileName: full-path to BUFR file (string)
+#    returnDict: dictionary with key/value pairs representing
+#                    keys: BUFR query (string)
+#                    values: variable name (string)
+#
+# OUTPUTS:
+#    outputDict: dictionary with key/value pairs representing
+#                    keys: variable name (string)
+#                    values: vector of values (numpy vector)
+#
+# DEPENDENCIES:
+#    _process_goes_tank (above)
+def process_NC005030(bufrFileName, returnDict):
+    return _process_goes_tank(bufrFileName, returnDict, tank='NC005030',
+                              qcParams={'preMin': 15000., 'preMax': np.inf, 'useCov': True, 'obType': 245})
+
+
+# process_NC005031: draws NC005031 observations (GOES WVDL AMVs) from BUFR file, and returns
+#                   variables based on entries in returnDict.
+#                   thin wrapper around _process_goes_tank (see above for the
+#                   full interface description); WVDL winds carry no CVWD check
+#
+# INPUTS:
+#    bufrFileName: full-path to BUFR file (string)
+#    returnDict: dictionary with key/value pairs representing
+#                    keys: BUFR query (string)
+#                    values: variable name (string)
+#
+# OUTPUTS:
+#    outputDict: dictionary with key/value pairs representing
+#                    keys: variable name (string)
+#                    values: vector of values (numpy vector)
+#
+# DEPENDENCIES:
+#    _process_goes_tank (above)
+def process_NC005031(bufrFileName, returnDict):
+    return _process_goes_tank(bufrFileName, returnDict, tank='NC005031',
+                              qcParams={'preMin': 15000., 'preMax': np.inf, 'useCov': False, 'obType': 247})
+
+
+# process_NC005032: draws NC005032 observations (GOES VIS AMVs) from BUFR file, and returns
+#                   variables based on entries in returnDict.
+#                   thin wrapper around _process_goes_tank (see above for the
+#                   full interface description); preMin=70000. is the low-level
+#                   cutoff for VIS winds
+#
+# INPUTS:
+#    bufrFileName: full-path to BUFR file (string)
+#    returnDict: dictionary with key/value pairs representing
+#                    keys: BUFR query (string)
+#                    values: variable name (string)
+#
+# OUTPUTS:
+#    outputDict: dictionary with key/value pairs representing
+#                    keys: variable name (string)
+#                    values: vector of values (numpy vector)
+#
+# DEPENDENCIES:
+#    _process_goes_tank (above)
+def process_NC005032(bufrFileName, returnDict):
+    return _process_goes_tank(bufrFileName, returnDict, tank='NC005032',
+                              qcParams={'preMin': 70000., 'preMax': np.inf, 'useCov': True, 'obType': 251})
+
+
+# process_NC005034: draws NC005034 observations (GOES WVCT AMVs) from BUFR file, and returns
+#                   variables based on entries in returnDict.
+#                   thin wrapper around _process_goes_tank (see above for the
+#                   full interface description); WVCT winds are restricted to
+#                   the preMin/preMax pressure band
+#
+# INPUTS:
+#    bufrFileName: full-path to BUFR file (string)
+#    returnDict: dictionary with key/value pairs representing
+#                    keys: BUFR query (string)
+#                    values: variable name (string)
+#
+# OUTPUTS:
+#    outputDict: dictionary with key/value pairs representing
+#                    keys: variable name (string)
+#                    values: vector of values (numpy vector)
+#
+# DEPENDENCIES:
+#    _process_goes_tank (above)
+def process_NC005034(bufrFileName, returnDict):
+    return _process_goes_tank(bufrFileName, returnDict, tank='NC005034',
+                              qcParams={'preMin': 15000., 'preMax': 30000., 'useCov': True, 'obType': 246})
+
+
 # process_NC005039: draws NC005039 observations (GOES SWIR AMVs) from BUFR file, and returns
 #                   variables based on entries in returnDict.
 #
@@ -744,8 +410,6 @@ def process_NC005034(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005039(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # define internal functions
     #
@@ -766,7 +430,6 @@ def process_NC005039(bufrFileName, returnDict):
     # DEPENDENCIES:
     #    numpy
     def pre_qc(pre, spd, zen, qin, cov, exp):
-        import numpy as np
         # generate vector of all indices and copy to idxPass
         idxAll = np.arange(np.size(pre))
         idxPass = np.copy(idxAll)
@@ -826,24 +489,17 @@ def process_NC005039(bufrFileName, returnDict):
     # merge this dictionary with returnDict, defaulting to these values where appropriate
     mergedDict = returnDict.copy()
     mergedDict.update(queryDict)
-    # initialize empty arrays for each pre-QC variable
-    pressure               = np.asarray([])
-    windSpeed              = np.asarray([])
-    zenithAngle            = np.asarray([])
-    qualityIndicator       = np.asarray([])
-    expectedError          = np.asarray([])
-    coefficientOfVariation = np.asarray([])
     # obtain resultSet from bufr_query()
     resultSet = bufr_query(bufrFileName, mergedDict)
-    # loop through keys, extract array from resultSet and append to appropriate variable array
-    # and/or outputDict as appropriate. This is done on a per-variable basis, because some
+    # loop through keys, extract array from resultSet and bind it to the appropriate
+    # variable and/or outputDict entry. This is done on a per-variable basis, because some
     # variables are packed together into multi-dimensional arrays and need to be split apart
     # to be sent to separate obs vectors. If you have a variable you want passed along to outputDict
     # that is one of these special cases, include it as a special case below.
     #
-    # these are all handled as appends to an initially empty obs vector, since you could have multiple
-    # individual queries point to the same output variable, e.g.: latitudes from multiple BUFR tanks
-    # all pulled into a single 'latitude' obs vector.
+    # a single bufr_query covers the whole tank and each variable appears exactly once,
+    # so results are bound directly; the np.append-onto-empty-vector accumulation this
+    # replaces re-allocated and copied the arrays without ever merging anything.
     outputDict = {}
     for varName in list(returnDict.values()):
         outputDict[varName] = np.asarray([])
@@ -851,35 +507,35 @@ def process_NC005039(bufrFileName, returnDict):
         print('processing '+ key + '...')
         x = resultSet.get(mergedDict[key])
         if mergedDict[key] == 'pressure':
-            pressure = np.append(pressure, x)
+            pressure = x
             if 'pressure' in list(returnDict.values()):
-                outputDict['pressure'] = np.append(outputDict['pressure'], x)
+                outputDict['pressure'] = x
         elif mergedDict[key] == 'windSpeed':
-            windSpeed = np.append(windSpeed, x)
+            windSpeed = x
             if 'windSpeed' in list(returnDict.values()):
-                outputDict['windSpeed'] = np.append(outputDict['windSpeed'], x)
+                outputDict['windSpeed'] = x
         elif mergedDict[key] == 'zenithAngle':
-            zenithAngle = np.append(zenithAngle, x)
+            zenithAngle = x
             if 'zenithAngle' in list(returnDict.values()):
-                outputDict['zenithAngle'] = np.append(outputDict['zenithAngle'], x)
+                outputDict['zenithAngle'] = x
         elif mergedDict[key] == 'QIEE':
-            qualityIndicator = np.append(qualityIndicator, x[:,1].squeeze())
-            expectedError = np.append(expectedError, x[:,3].squeeze())
+            qualityIndicator = x[:,1].squeeze()
+            expectedError = x[:,3].squeeze()
             if 'qualityIndicator' in list(returnDict.values()):
-                outputDict['qualityIndicator'] = np.append(outputDict['qualityIndicator'], x[:,1].squeeze())
+                outputDict['qualityIndicator'] = x[:,1].squeeze()
             if 'expectedError' in list(returnDict.values()):
-                outputDict['expectedError'] = np.append(outputDict['expectedError'], x[:,3].squeeze())
+                outputDict['expectedError'] = x[:,3].squeeze()
         elif mergedDict[key] == 'coefficientOfVariation':
-            coefficientOfVariation = np.append(coefficientOfVariation, x[:,0].squeeze())
+            coefficientOfVariation = x[:,0].squeeze()
             if 'coefficientOfVariation' in list(returnDict.values()):
-                outputDict['coefficientOfVariation'] = np.append(outputDict['coefficientOfVariation'], x[:,0].squeeze())
+                outputDict['coefficientOfVariation'] = x[:,0].squeeze()
         else:
             # all variables in mergedDict not in queryDict, assumed to be simple variables with no
             # unpacking of multi-dimensional arrays necessary, but if any special cases exist feel free
             # to add them here if they aren't already a pre-QC variable in queryDict
             print('key: ' + key + ' is NOT a pre-QC key')
             if mergedDict[key] in list(returnDict.values()):
-                outputDict[mergedDict[key]] = np.append(outputDict[mergedDict[key]], x)
+                outputDict[mergedDict[key]] = x
     # perform pre-QC checks
     idxPass, idxFail = pre_qc(pre=pressure,
                               spd=windSpeed,
@@ -923,8 +579,6 @@ def process_NC005039(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005044(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # define internal functions
     #
@@ -942,7 +596,6 @@ def process_NC005044(bufrFileName, returnDict):
     # DEPENDENCIES:
     #    numpy
     def pre_qc(zen, qin, wcm):
-        import numpy as np
         # generate vector of all indices and copy to idxPass
         idxAll = np.arange(np.size(zen))
         idxPass = np.copy(idxAll)
@@ -978,28 +631,25 @@ def process_NC005044(bufrFileName, returnDict):
     queryDict = {
                  'NC005044/SAZA'        : 'zenithAngle',            # (nobs,) dimension
                  'NC005044/SWCM'        : 'windComputationMethod',  # (nobs,) dimension, as (int) type
-                 'NC005044/QCPRMS[1]/PCCF' : 'qualityIndicator'     # (nobs,3) dimension
+                 'NC005044/QCPRMS[1]/PCCF' : 'qualityIndicator',    # (nobs,3) dimension
                                                                     # there are multiple copies of QCPRMS/PCCF but all should be identical
                                                                     # qifn is stored where QCPRMS/GNAP == 102
+                 'NC005044/QCPRMS[1]/GNAP' : 'generatingApplication'  # (nobs,3) dimension, identifies which PCCF column holds qifn
                 }
     # merge this dictionary with returnDict, defaulting to these values where appropriate
     mergedDict = returnDict.copy()
     mergedDict.update(queryDict)
-    # initialize empty arrays for each pre-QC variable
-    zenithAngle            = np.asarray([])
-    qualityIndicator       = np.asarray([])
-    windComputationMethod  = np.asarray([])
     # obtain resultSet from bufr_query()
     resultSet = bufr_query(bufrFileName, mergedDict)
-    # loop through keys, extract array from resultSet and append to appropriate variable array
-    # and/or outputDict as appropriate. This is done on a per-variable basis, because some
+    # loop through keys, extract array from resultSet and bind it to the appropriate
+    # variable and/or outputDict entry. This is done on a per-variable basis, because some
     # variables are packed together into multi-dimensional arrays and need to be split apart
     # to be sent to separate obs vectors. If you have a variable you want passed along to outputDict
     # that is one of these special cases, include it as a special case below.
     #
-    # these are all handled as appends to an initially empty obs vector, since you could have multiple
-    # individual queries point to the same output variable, e.g.: latitudes from multiple BUFR tanks
-    # all pulled into a single 'latitude' obs vector.
+    # a single bufr_query covers the whole tank and each variable appears exactly once,
+    # so results are bound directly; the np.append-onto-empty-vector accumulation this
+    # replaces re-allocated and copied the arrays without ever merging anything.
     outputDict = {}
     for varName in list(returnDict.values()):
         outputDict[varName] = np.asarray([])
@@ -1007,36 +657,41 @@ def process_NC005044(bufrFileName, returnDict):
         print('processing '+ key + '...')
         x = resultSet.get(mergedDict[key])
         if mergedDict[key] == 'zenithAngle':
-            zenithAngle = np.append(zenithAngle, x)
+            zenithAngle = x
             if 'zenithAngle' in list(returnDict.values()):
-                outputDict['zenithAngle'] = np.append(outputDict['zenithAngle'], x)
+                outputDict['zenithAngle'] = x
         elif mergedDict[key] == 'qualityIndicator':
             # initialize output array as missing-values
             z = 1.0E+10 * np.ones((np.shape(x)[0],))
-            # perform separate BUFR query for generatingApplication data
-            querySubDict = {'NC005044/QCPRMS[1]/GNAP' : 'generatingApplication'}
-            resultSubSet = bufr_query(bufrFileName, querySubDict)
-            y = resultSubSet.get('generatingApplication')
+            # generatingApplication is drawn from the shared resultSet rather than
+            # re-opening the BUFR file with a separate single-entry query
+            y = resultSet.get('generatingApplication')
             # find index where y[:,i] == 102 to extract qualityIndicator from x
             for i in range(3):
                 if np.unique(y[:,i].squeeze()) == 102:
                     print('found qualityIndicator for i={:d}'.format(i))
                     z[:] = x[:,i].squeeze()
             # append z to qualityIndicator
-            qualityIndicator = np.append(qualityIndicator, z)
+            qualityIndicator = z
             if 'qualityIndicator' in list(returnDict.values()):
-                outputDict['qualityIndicator'] = np.append(outputDict['qualityIndicator'], z)
+                outputDict['qualityIndicator'] = z
         elif mergedDict[key] == 'windComputationMethod':
-            windComputationMethod = np.append(windComputationMethod, x)
+            windComputationMethod = x
             if 'windComputationMethod' in list(returnDict.values()):
-                outputDict['windComputationMethod'] = np.append(outputDict['windComputationMethod'], x)
+                outputDict['windComputationMethod'] = x
+        elif mergedDict[key] == 'generatingApplication':
+            # consumed in the qualityIndicator branch above to locate the qifn
+            # column, but still passed through when the caller requests it
+            if 'generatingApplication' in list(returnDict.values()):
+                outputDict['generatingApplication'] = x
+            continue
         else:
             # all variables in mergedDict not in queryDict, assumed to be simple variables with no
             # unpacking of multi-dimensional arrays necessary, but if any special cases exist feel free
             # to add them here if they aren't already a pre-QC variable in queryDict
             print('key: ' + key + ' is NOT a pre-QC key')
             if mergedDict[key] in list(returnDict.values()):
-                outputDict[mergedDict[key]] = np.append(outputDict[mergedDict[key]], x)
+                outputDict[mergedDict[key]] = x
     # perform pre-QC checks
     idxPass, idxFail = pre_qc(zen=zenithAngle,
                               qin=qualityIndicator,
@@ -1081,8 +736,6 @@ def process_NC005044(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005045(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # define internal functions
     #
@@ -1100,7 +753,6 @@ def process_NC005045(bufrFileName, returnDict):
     # DEPENDENCIES:
     #    numpy
     def pre_qc(zen, qin, wcm):
-        import numpy as np
         # generate vector of all indices and copy to idxPass
         idxAll = np.arange(np.size(zen))
         idxPass = np.copy(idxAll)
@@ -1136,28 +788,25 @@ def process_NC005045(bufrFileName, returnDict):
     queryDict = {
                  'NC005045/SAZA'        : 'zenithAngle',            # (nobs,) dimension
                  'NC005045/SWCM'        : 'windComputationMethod',  # (nobs,) dimension, as (int) type
-                 'NC005045/QCPRMS[1]/PCCF' : 'qualityIndicator'     # (nobs,3) dimension
+                 'NC005045/QCPRMS[1]/PCCF' : 'qualityIndicator',    # (nobs,3) dimension
                                                                     # there are multiple copies of QCPRMS/PCCF but all should be identical
                                                                     # qifn is stored where QCPRMS/GNAP == 102
+                 'NC005045/QCPRMS[1]/GNAP' : 'generatingApplication'  # (nobs,3) dimension, identifies which PCCF column holds qifn
                 }
     # merge this dictionary with returnDict, defaulting to these values where appropriate
     mergedDict = returnDict.copy()
     mergedDict.update(queryDict)
-    # initialize empty arrays for each pre-QC variable
-    zenithAngle            = np.asarray([])
-    qualityIndicator       = np.asarray([])
-    windComputationMethod  = np.asarray([])
     # obtain resultSet from bufr_query()
     resultSet = bufr_query(bufrFileName, mergedDict)
-    # loop through keys, extract array from resultSet and append to appropriate variable array
-    # and/or outputDict as appropriate. This is done on a per-variable basis, because some
+    # loop through keys, extract array from resultSet and bind it to the appropriate
+    # variable and/or outputDict entry. This is done on a per-variable basis, because some
     # variables are packed together into multi-dimensional arrays and need to be split apart
     # to be sent to separate obs vectors. If you have a variable you want passed along to outputDict
     # that is one of these special cases, include it as a special case below.
     #
-    # these are all handled as appends to an initially empty obs vector, since you could have multiple
-    # individual queries point to the same output variable, e.g.: latitudes from multiple BUFR tanks
-    # all pulled into a single 'latitude' obs vector.
+    # a single bufr_query covers the whole tank and each variable appears exactly once,
+    # so results are bound directly; the np.append-onto-empty-vector accumulation this
+    # replaces re-allocated and copied the arrays without ever merging anything.
     outputDict = {}
     for varName in list(returnDict.values()):
         outputDict[varName] = np.asarray([])
@@ -1165,36 +814,41 @@ def process_NC005045(bufrFileName, returnDict):
         print('processing '+ key + '...')
         x = resultSet.get(mergedDict[key])
         if mergedDict[key] == 'zenithAngle':
-            zenithAngle = np.append(zenithAngle, x)
+            zenithAngle = x
             if 'zenithAngle' in list(returnDict.values()):
-                outputDict['zenithAngle'] = np.append(outputDict['zenithAngle'], x)
+                outputDict['zenithAngle'] = x
         elif mergedDict[key] == 'qualityIndicator':
             # initialize output array as missing-values
             z = 1.0E+10 * np.ones((np.shape(x)[0],))
-            # perform separate BUFR query for generatingApplication data
-            querySubDict = {'NC005045/QCPRMS[1]/GNAP' : 'generatingApplication'}
-            resultSubSet = bufr_query(bufrFileName, querySubDict)
-            y = resultSubSet.get('generatingApplication')
+            # generatingApplication is drawn from the shared resultSet rather than
+            # re-opening the BUFR file with a separate single-entry query
+            y = resultSet.get('generatingApplication')
             # find index where y[:,i] == 102 to extract qualityIndicator from x
             for i in range(3):
                 if np.unique(y[:,i].squeeze()) == 102:
                     print('found qualityIndicator for i={:d}'.format(i))
                     z[:] = x[:,i].squeeze()
             # append z to qualityIndicator
-            qualityIndicator = np.append(qualityIndicator, z)
+            qualityIndicator = z
             if 'qualityIndicator' in list(returnDict.values()):
-                outputDict['qualityIndicator'] = np.append(outputDict['qualityIndicator'], z)
+                outputDict['qualityIndicator'] = z
         elif mergedDict[key] == 'windComputationMethod':
-            windComputationMethod = np.append(windComputationMethod, x)
+            windComputationMethod = x
             if 'windComputationMethod' in list(returnDict.values()):
-                outputDict['windComputationMethod'] = np.append(outputDict['windComputationMethod'], x)
+                outputDict['windComputationMethod'] = x
+        elif mergedDict[key] == 'generatingApplication':
+            # consumed in the qualityIndicator branch above to locate the qifn
+            # column, but still passed through when the caller requests it
+            if 'generatingApplication' in list(returnDict.values()):
+                outputDict['generatingApplication'] = x
+            continue
         else:
             # all variables in mergedDict not in queryDict, assumed to be simple variables with no
             # unpacking of multi-dimensional arrays necessary, but if any special cases exist feel free
             # to add them here if they aren't already a pre-QC variable in queryDict
             print('key: ' + key + ' is NOT a pre-QC key')
             if mergedDict[key] in list(returnDict.values()):
-                outputDict[mergedDict[key]] = np.append(outputDict[mergedDict[key]], x)
+                outputDict[mergedDict[key]] = x
     # perform pre-QC checks
     idxPass, idxFail = pre_qc(zen=zenithAngle,
                               qin=qualityIndicator,
@@ -1239,8 +893,6 @@ def process_NC005045(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005046(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # define internal functions
     #
@@ -1258,7 +910,6 @@ def process_NC005046(bufrFileName, returnDict):
     # DEPENDENCIES:
     #    numpy
     def pre_qc(zen, qin, wcm):
-        import numpy as np
         # generate vector of all indices and copy to idxPass
         idxAll = np.arange(np.size(zen))
         idxPass = np.copy(idxAll)
@@ -1294,9 +945,10 @@ def process_NC005046(bufrFileName, returnDict):
     queryDict = {
                  'NC005046/SAZA'        : 'zenithAngle',            # (nobs,) dimension
                  'NC005046/SWCM'        : 'windComputationMethod',  # (nobs,) dimension, as (int) type
-                 'NC005046/QCPRMS[1]/PCCF' : 'qualityIndicator'     # (nobs,3) dimension
+                 'NC005046/QCPRMS[1]/PCCF' : 'qualityIndicator',    # (nobs,3) dimension
                                                                     # there are multiple copies of QCPRMS/PCCF but all should be identical
                                                                     # qifn is stored where QCPRMS/GNAP == 102
+                 'NC005046/QCPRMS[1]/GNAP' : 'generatingApplication'  # (nobs,3) dimension, identifies which PCCF column holds qifn
                 }
     # merge this dictionary with returnDict, defaulting to these values where appropriate
     mergedDict = returnDict.copy()
@@ -1329,10 +981,9 @@ def process_NC005046(bufrFileName, returnDict):
         elif mergedDict[key] == 'qualityIndicator':
             # initialize output array as missing-values
             z = 1.0E+10 * np.ones((np.shape(x)[0],))
-            # perform separate BUFR query for generatingApplication data
-            querySubDict = {'NC005046/QCPRMS[1]/GNAP' : 'generatingApplication'}
-            resultSubSet = bufr_query(bufrFileName, querySubDict)
-            y = resultSubSet.get('generatingApplication')
+            # generatingApplication is drawn from the shared resultSet rather than
+            # re-opening the BUFR file with a separate single-entry query
+            y = resultSet.get('generatingApplication')
             # find index where y[:,i] == 102 to extract qualityIndicator from x
             for i in range(3):
                 if np.unique(y[:,i].squeeze()) == 102:
@@ -1346,6 +997,12 @@ def process_NC005046(bufrFileName, returnDict):
             windComputationMethod = np.append(windComputationMethod, x)
             if 'windComputationMethod' in list(returnDict.values()):
                 outputDict['windComputationMethod'] = np.append(outputDict['windComputationMethod'], x)
+        elif mergedDict[key] == 'generatingApplication':
+            # consumed in the qualityIndicator branch above to locate the qifn
+            # column, but still passed through when the caller requests it
+            if 'generatingApplication' in list(returnDict.values()):
+                outputDict['generatingApplication'] = x
+            continue
         else:
             # all variables in mergedDict not in queryDict, assumed to be simple variables with no
             # unpacking of multi-dimensional arrays necessary, but if any special cases exist feel free
@@ -1397,8 +1054,6 @@ def process_NC005046(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005067(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # define internal functions
     #
@@ -1416,7 +1071,6 @@ def process_NC005067(bufrFileName, returnDict):
     # DEPENDENCIES:
     #    numpy
     def pre_qc(zen, qin, wcm):
-        import numpy as np
         # generate vector of all indices and copy to idxPass
         idxAll = np.arange(np.size(zen))
         idxPass = np.copy(idxAll)
@@ -1540,8 +1194,6 @@ def process_NC005067(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005068(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # define internal functions
     #
@@ -1559,7 +1211,6 @@ def process_NC005068(bufrFileName, returnDict):
     # DEPENDENCIES:
     #    numpy
     def pre_qc(zen, qin, wcm):
-        import numpy as np
         # generate vector of all indices and copy to idxPass
         idxAll = np.arange(np.size(zen))
         idxPass = np.copy(idxAll)
@@ -1683,8 +1334,6 @@ def process_NC005068(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005069(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # define internal functions
     #
@@ -1702,7 +1351,6 @@ def process_NC005069(bufrFileName, returnDict):
     # DEPENDENCIES:
     #    numpy
     def pre_qc(zen, qin, wcm):
-        import numpy as np
         # generate vector of all indices and copy to idxPass
         idxAll = np.arange(np.size(zen))
         idxPass = np.copy(idxAll)
@@ -1827,8 +1475,6 @@ def process_NC005069(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005070(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # No pre-QC checks on NC005070, return preQC as effectively all passed (=1) values
     #
@@ -1903,8 +1549,6 @@ def process_NC005070(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005071(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # No pre-QC checks on NC005071, return preQC as effectively all passed (=1) values
     #
@@ -1978,8 +1622,6 @@ def process_NC005071(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005072(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # No pre-QC checks on NC005072, return preQC as effectively all passed (=1) values
     #
@@ -2051,8 +1693,6 @@ def process_NC005072(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005080(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # No pre-QC checks on NC005080, return preQC as effectively all passed (=1) values
     #
@@ -2125,8 +1765,6 @@ def process_NC005080(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005081(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # No pre-QC checks on NC005081, return preQC as effectively all passed (=1) values
     #
@@ -2199,8 +1837,6 @@ def process_NC005081(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005090(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # No pre-QC checks on NC005090, return preQC as effectively all passed (=1) values
     #
@@ -2273,8 +1909,6 @@ def process_NC005090(bufrFileName, returnDict):
 #    bufr
 #    bufr_query (above)
 def process_NC005091(bufrFileName, returnDict):
-    import numpy as np
-    import bufr
     #
     # No pre-QC checks on NC005091, return preQC as effectively all passed (=1) values
     #
@@ -2631,3 +2265,48 @@ def process_satwnd_tank(tankName, bufrFileName, returnDict):
         # process and return outputDict
         outputDict = process_NC005091(bufrFileName, returnDict)
         return outputDict
+
+
+# process_all: process several tanks from one BUFR file in parallel and merge the
+#              per-tank outputs into a single outputDict.
+#
+# the per-tank processors are independent of one another (each runs its own
+# bufr_query and pre-QC), so the dominant BUFR-decode cost fans out across
+# worker processes rather than running serially; results are merged in the
+# caller's tank order
+#
+# INPUTS:
+#    bufrFileName: full-path to BUFR file (string)
+#    returnDicts: dictionary with key/value pairs representing
+#                    keys: tank name (string, NC005xxx)
+#                    values: returnDict for that tank (see process_satwnd_tank)
+#
+# OUTPUTS:
+#    outputDict: dictionary with key/value pairs representing
+#                    keys: variable name (string)
+#                    values: vector of values concatenated across tanks (numpy vector)
+#
+# DEPENDENCIES:
+#    numpy
+#    os
+#    concurrent.futures.ProcessPoolExecutor
+#    process_satwnd_tank (above)
+def process_all(bufrFileName, returnDicts):
+    tankNames = list(returnDicts.keys())
+    nWorkers = max(1, min(len(tankNames), os.cpu_count()))
+    with ProcessPoolExecutor(max_workers=nWorkers) as executor:
+        tankDicts = list(executor.map(process_satwnd_tank, tankNames,
+                                      [bufrFileName] * len(tankNames),
+                                      [returnDicts[tankName] for tankName in tankNames]))
+    # collect per-tank arrays into lists and concatenate once per variable, so
+    # each merged obs vector is built with a single copy
+    buf = {}
+    for tankDict in tankDicts:
+        for varName, x in tankDict.items():
+            buf.setdefault(varName, []).append(x)
+    outputDict = {varName: np.concatenate(chunks) for varName, chunks in buf.items()}
+    # return outputDict
+    return outputDict
+    #
+    # end
+    #